@@ -1,7 +1,13 @@
+import contextlib
+import functools
+import pickle
 from collections import OrderedDict
+from collections.abc import MutableMapping
 
+import numpy as np
 import torch as T
 import torch.nn as nn
+from torch.nn.utils.fusion import fuse_conv_bn_eval
 
 from .. import utils
 
@@ -9,6 +15,108 @@ __all__ = ['Net', 'wrapper', 'Sequential', 'Lambda', 'Module', 'MultiSingleInput
            'SingleMultiInputModule']
 
 
+def _infer_output_shape(module, forward, input_shape):
+    """
+    Computes the output shape of `module` by performing a dummy forward pass.
+    Unknown dimensions in `input_shape` are replaced by 1 for the forward pass
+    and set back to ``None`` in the result.
+    """
+
+    none_indices = [k for k in range(len(input_shape)) if input_shape[k] is None]
+    shape = [1 if s is None else s for s in input_shape]
+    param = next(module.parameters(), None)
+    device = param.device if param is not None else 'cpu'
+    # no_grad rather than inference_mode since the module may keep tensors
+    # created in this pass, which must stay usable in training
+    with T.no_grad():
+        dummy = forward(T.zeros(*shape, device=device))
+
+    output_shape = list(dummy.shape)
+    for k in none_indices:
+        output_shape[k] = None
+    return tuple(output_shape)
+
+
+class _cached_output_shape:
+    """
+    Like :func:`functools.cached_property`, but validates the result with :func:`~neuralnet_pytorch.utils.validate`.
+    The validated shape is stored in the instance ``__dict__`` under the same name,
+    so later reads bypass the descriptor entirely.
+    Call :func:`_reset_output_shape` to recompute it.
+    """
+
+    def __init__(self, func):
+        self.func = utils.validate(func)
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+
+        shape = self.func(instance)
+        instance.__dict__[self.name] = shape
+        return shape
+
+
+def _reset_output_shape(module):
+    module.__dict__.pop('output_shape', None)
+
+
+class _SlotDict(MutableMapping):
+    """
+    Makes the slots of a subclass accessible like a ``dict`` with fixed keys.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+
+        setattr(self, key, value)
+
+    def __delitem__(self, key):
+        raise TypeError('Keys of {} cannot be deleted'.format(type(self).__name__))
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self):
+        return len(self.__slots__)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class _StatsBucket(_SlotDict):
+    """
+    Holds the statistics of either training or evaluation.
+    """
+
+    __slots__ = ('scalars', 'images', 'histograms', 'pointclouds')
+
+    def __init__(self):
+        self.scalars, self.images, self.histograms, self.pointclouds = {}, {}, {}, {}
+
+
+class _Stats(_SlotDict):
+    """
+    Holds the statistics of training and evaluation in :attr:`train` and :attr:`eval`.
+    """
+
+    __slots__ = ('train', 'eval')
+
+    def __init__(self):
+        self.train, self.eval = _StatsBucket(), _StatsBucket()
+
+
 class Net:
     """
     This abstract class is useful when you want to use
@@ -35,29 +143,18 @@ class Net:
     optim
         a dictionary that contains the optimizer and scheduler for optimization.
     stats
-        a dictionary to hold the interested statistics from training and evaluation.
-        For each ``'train'`` and ``'eval'`` keys, an other dictionary with several
-        built-in keys.
-        The possible keys are: ``'scalars'``, ``'images'``, ``'histograms'``,
-        and  ``'pointclouds'``.
+        an object to hold the interested statistics from training and evaluation.
+        For each ``train`` and ``eval`` attributes, there are several
+        built-in dictionaries, which are
+        ``scalars``, ``images``, ``histograms``, and ``pointclouds``.
+        For example, ``self.stats.train.scalars['loss'] = loss``.
+        The old dictionary access ``self.stats['train']['scalars']`` still works,
+        and :attr:`stats` can be replaced by a dictionary of the same layout.
     """
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-
-        self.stats = {'train': {
-                'scalars': {},
-                'images': {},
-                'histograms': {},
-                'pointclouds': {}
-            },
-            'eval': {
-                'scalars': {},
-                'images': {},
-                'histograms': {},
-                'pointclouds': {}
-            }
-        }
+        self.stats = _Stats()
 
     def train_procedure(self, *args, **kwargs):
         """
@@ -73,10 +170,40 @@ class Net:
         The optimization can be defined here.
         Usually, it includes zeroing gradients, optimizing the loss,
         and collect statistics.
+        When gradients are accumulated over several micro-batches,
+        wrap each backward pass in :meth:`~accumulate`.
+
+        .. code-block:: python
+
+            for step, batch in enumerate(micro_batches):
+                with self.accumulate(model, is_last=step == len(micro_batches) - 1):
+                    loss = self.train_procedure(*batch)
+                    loss.backward()
+
+            optim['optimizer'].step()
         """
 
         raise NotImplementedError
 
+    def accumulate(self, model, is_last):
+        """
+        Returns a context manager for one backward pass of gradient accumulation.
+        If `model` is a :class:`torch.nn.parallel.DistributedDataParallel`,
+        gradient synchronization is skipped for all but the last micro-batch.
+
+        :param model:
+            the model performing the forward and backward passes.
+        :param is_last:
+            whether this is the last micro-batch before the optimization step.
+        :return:
+            :meth:`torch.nn.parallel.DistributedDataParallel.no_sync` or an empty context.
+        """
+
+        if not is_last and isinstance(model, nn.parallel.DistributedDataParallel):
+            return model.no_sync()
+
+        return contextlib.ExitStack()  # an empty context as contextlib.nullcontext requires Python 3.7
+
     def eval_procedure(self, *args, **kwargs):
         """
         If specified, an evaluation will be performed for your model.
@@ -91,6 +218,18 @@ class _LayerMethod:
     This mixin class contains various attributes to extend :mod:`torch` modules.
     """
 
+    # these properties are for network construction only and are not compiled by TorchScript
+    __jit_unused_properties__ = ['output_shape', 'params', 'trainable', 'regularizable']
+    _reserved_names = ('params', 'trainable', 'regularizable', 'save', 'load', 'reset_parameters')
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        mro = cls.__mro__
+        for base in mro[mro.index(_LayerMethod) + 1:]:
+            for name in _LayerMethod._reserved_names:
+                assert name not in vars(base), '{}.{} conflicts with _LayerMethod.{}'.format(
+                    base.__name__, name, name)
+
     @property
     @utils.validate
     def output_shape(self):
@@ -106,7 +245,6 @@ class _LayerMethod:
         Return a tuple of all the parameters in the module.
         """
 
-        assert not hasattr(super(), 'params')
         return tuple(self.state_dict().values())
 
     @property
@@ -115,7 +253,6 @@ class _LayerMethod:
         Return a tuple of all parameters with :attr:`requires_grad` set to `True`.
         """
 
-        assert not hasattr(super(), 'trainable')
         params = []
         if hasattr(self, 'parameters'):
             params = [p for p in self.parameters() if p.requires_grad]
@@ -127,44 +264,94 @@ class _LayerMethod:
         Returns a tuple of parameters to be regularized.
         """
 
-        assert not hasattr(super(), 'regularizable')
         params = []
-        if hasattr(self, 'weight'):
-            if self.weight.requires_grad:
-                params += [self.weight]
+        for m in self.modules():
+            # looks up the dictionaries directly since a missing attribute
+            # goes through the slow nn.Module.__getattr__
+            if 'weight' in m._parameters:
+                weight = m._parameters['weight']
+            elif 'weight' in m.__dict__:
+                weight = m.__dict__['weight']
+            elif hasattr(type(m), 'weight'):
+                # e.g., parametrized weights are properties of the class
+                weight = getattr(m, 'weight', None)
+            else:
+                continue
 
-        for m in list(self.children()):
-            if hasattr(m, 'regularizable'):
-                params.extend(m.regularizable)
+            if isinstance(weight, T.Tensor) and weight.requires_grad:
+                params.append(weight)
 
         return tuple(params)
 
-    def save(self, param_file):
+    def save(self, param_file, numpy=False, pack=False):
         """
-        Save the weights of the model in :class:`numpy.nrdarray` format.
+        Save the weights of the model.
 
         :param param_file:
             path to the weight file.
+        :param numpy:
+            whether to save the weights in :class:`numpy.ndarray` format
+            instead of :class:`torch.Tensor`.
+            Default: ``False``.
+        :param pack:
+            whether to pack all the weights into a single buffer
+            using :func:`~neuralnet_pytorch.utils.pack_state`.
+            This takes precedence over `numpy`.
+            Packing and loading packed files require Pytorch 1.11 or later.
+            Default: ``False``.
         """
 
-        assert not hasattr(super(), 'save')
-        params_np = utils.bulk_to_numpy(self.params)
-        params_dict = OrderedDict(zip(list(self.state_dict().keys()), params_np))
-        T.save(params_dict, param_file)
+        state_dict = self.state_dict()
+        if pack:
+            state_dict = utils.pack_state(state_dict)
+        elif numpy:
+            state_dict = OrderedDict(zip(state_dict.keys(), utils.bulk_to_numpy(state_dict.values())))
+
+        T.save(state_dict, param_file)
         print('Model weights dumped to %s' % param_file)
 
-    def load(self, param_file, eval=True):
+    def load(self, param_file, eval=True, weights_only=None):
         """
-        Load the `numpy.ndarray` weights from file.
+        Load the weights from file directly to the device of the module.
+        Files containing `numpy.ndarray` weights or packed weights are supported as well.
 
         :param param_file:
             path to the weight file.
         :param eval:
             whether to use evaluation mode or not.
+        :param weights_only:
+            passed to :func:`torch.load`.
+            If ``None``, the default of the installed Pytorch is used,
+            which is ``True`` from Pytorch 2.6.
+            Files containing `numpy.ndarray` weights, e.g., files saved with ``numpy=True``,
+            can only be loaded with ``weights_only=False``.
+            Only use it for trusted files as unpickling can execute arbitrary code.
+            Default: ``None``.
         """
 
-        assert not hasattr(super(), 'load')
-        params_dict = T.load(param_file)
+        param = next(self.parameters(), None)
+        device = param.device if param is not None else 'cpu'
+        kwargs = {} if weights_only is None else {'weights_only': weights_only}
+        try:
+            try:
+                # memory-maps the file instead of reading it into memory first
+                params_dict = T.load(param_file, map_location=device, mmap=True, **kwargs)
+            except (TypeError, RuntimeError):
+                # mmap requires Pytorch 2.1 and a file saved in zipfile format
+                params_dict = T.load(param_file, map_location=device, **kwargs)
+        except pickle.UnpicklingError as e:
+            # only explains failures of the restricted unpickler, which may be used by default
+            if weights_only is False or (weights_only is None and 'weights only' not in str(e).lower()):
+                raise
+
+            raise pickle.UnpicklingError('Cannot load %s with weights_only. '
+                                         'If the file is trusted, load it with weights_only=False' % param_file) from e
+
+        if isinstance(params_dict, tuple):
+            params_dict = utils.unpack_state(*params_dict, device=device)
+
+        params_dict = OrderedDict((k, T.as_tensor(v, device=device) if isinstance(v, np.ndarray) else v)
+                                  for k, v in params_dict.items())
         self.load_state_dict(params_dict)
         if eval:
             self.eval()
@@ -176,9 +363,111 @@ class _LayerMethod:
         Used for custom weight initialization.
         """
 
-        assert not hasattr(super(), 'reset_parameters')
         pass
 
+    def to_channels_last(self):
+        """
+        Converts the weights of all 2D convolutions in the module to
+        :attr:`torch.channels_last` memory format so that NHWC kernels can be used.
+        Other parameters are left unchanged.
+        The input should also be converted by
+        ``input.contiguous(memory_format=torch.channels_last)``.
+
+        :return:
+            the module itself.
+        """
+
+        for m in self.modules():
+            if isinstance(m, nn.Conv2d):
+                m.weight.data = m.weight.data.contiguous(memory_format=T.channels_last)
+
+        return self
+
+    def fuse_for_inference(self):
+        """
+        Switches the module to evaluation mode and folds every batch normalization
+        into the convolution right before it, in all :class:`torch.nn.Sequential`
+        containers of the module.
+        See :meth:`~neuralnet_pytorch.layers.Sequential.fuse`.
+
+        :return:
+            the module itself.
+        """
+
+        self.eval()
+        for m in list(self.modules()):
+            if isinstance(m, nn.Sequential):
+                _fuse_conv_bn(m)
+
+        return self
+
+    def enable_jit(self, example_inputs=None):
+        """
+        Compiles each child of the module with TorchScript.
+        A child is compiled by :func:`torch.jit.script` if possible.
+        Otherwise, if `example_inputs` is given, it is traced by :func:`torch.jit.trace`
+        with the input it receives when the module is run on `example_inputs`.
+        Tracing records the current mode, so call :meth:`~torch.nn.Module.eval` first
+        if the module is meant for inference.
+        Children that can be neither scripted nor traced are left untouched.
+        The buffers, e.g., the running statistics of batch normalization,
+        are restored after the forward passes used for tracing.
+
+        TorchScript optimizes the graphs during the first forward passes,
+        so run a few warm-up iterations, preferably under
+        ``torch.jit.optimized_execution(True)``, before timing the module.
+
+        :param example_inputs:
+            a tensor or a tuple of tensors to be input to the module.
+            Can be ``None``.
+        :return:
+            the module itself.
+        """
+
+        # forward passes in training mode update buffers such as running statistics
+        buffers = [(buffer, buffer.clone()) for buffer in self.buffers()]
+        child_inputs = {}
+        if example_inputs is not None:
+            if isinstance(example_inputs, T.Tensor):
+                example_inputs = (example_inputs,)
+
+            def record(name):
+                def hook(module, input):
+                    child_inputs.setdefault(name, input)
+
+                return hook
+
+            handles = [child.register_forward_pre_hook(record(name)) for name, child in self.named_children()]
+            with T.no_grad():
+                self(*example_inputs)
+
+            for handle in handles:
+                handle.remove()
+
+        for name, child in list(self.named_children()):
+            try:
+                compiled = T.jit.script(child)
+            except Exception:
+                if name not in child_inputs:
+                    continue
+
+                try:
+                    compiled = T.jit.trace(child, child_inputs[name])
+                except Exception:
+                    continue
+
+            for attr in ('input_shape', 'output_shape'):
+                if hasattr(child, attr):
+                    setattr(compiled, attr, getattr(child, attr))
+
+            setattr(self, name, compiled)
+
+        with T.no_grad():
+            for buffer, value in buffers:
+                buffer.copy_(value)
+
+        return self
+
 
 @utils.add_simple_repr
 class Module(nn.Module, _LayerMethod):
@@ -199,6 +488,38 @@ class Module(nn.Module, _LayerMethod):
         self.input_shape = input_shape
 
 
+@utils.add_simple_repr
+class _Constant(Module):
+    """
+    Returns a constant tensor regardless of the input.
+    The tensor is registered as a non-persistent buffer so that it follows the module
+    when the module is moved to another device or data type.
+    A tensor requiring gradient, e.g., a parameter of another module, is kept by reference
+    instead, so that it is not replaced by a stale copy when the module is moved.
+
+    Parameters
+    ----------
+    tensor
+        the constant tensor.
+    """
+
+    def __init__(self, tensor):
+        super().__init__(tensor.shape)
+        if tensor.requires_grad:
+            # bypasses nn.Module.__setattr__, which would register a parameter
+            object.__setattr__(self, 'value', tensor)
+        else:
+            self.register_buffer('value', tensor, persistent=False)
+
+    def forward(self, *args, **kwargs):
+        return self.value
+
+    @property
+    @utils.validate
+    def output_shape(self):
+        return self.value.shape
+
+
 @utils.add_simple_repr
 class MultiSingleInputModule(Module):
     """
@@ -210,6 +531,7 @@ class MultiSingleInputModule(Module):
     ----------
     modules_or_tensors
         a list of modules or tensors whose results are fused together.
+        A module given more than once is run once for each occurrence.
 
     Attributes
     ----------
@@ -223,22 +545,68 @@ class MultiSingleInputModule(Module):
 
         super().__init__()
         self.input_shape = []
+        self._ordered_children = None
 
-        def foo(item):
-            idx = len(list(self.children()))
+        for idx, item in enumerate(modules_or_tensors):
             if isinstance(item, nn.Module):
                 self.add_module('module%d' % idx, item)
                 self.input_shape.append(item.output_shape)
             else:
-                self.add_module('tensor%d' % idx, Lambda(lambda *args, **kwargs: item, input_shape=item.shape,
-                                                         output_shape=item.shape))
+                self.add_module('tensor%d' % idx, _Constant(item))
                 self.input_shape.append(item.shape)
 
-        list(map(foo, modules_or_tensors))
         self.input_shape = tuple(self.input_shape)
 
+    def add_module(self, name, module):
+        super().add_module(name, module)
+        self._ordered_children = None
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in self.__dict__.get('_modules', ()):
+            self._ordered_children = None
+
+    def __delattr__(self, name):
+        super().__delattr__(name)
+        self._ordered_children = None
+
+    def _children_with_kinds(self):
+        """
+        Returns a tuple of ``(takes_input, module)`` of the children in order,
+        where `takes_input` is ``False`` for tensor constants.
+        The tuple is rebuilt only after the children change.
+        """
+
+        if self._ordered_children is None:
+            self._ordered_children = tuple((not isinstance(module, _Constant), module)
+                                           for module in self._modules.values())
+        return self._ordered_children
+
     def forward(self, input, *args, **kwargs):
-        outputs = [module(input, *args, **kwargs) for name, module in self.named_children()]
+        modules = list(self._modules.values())
+        # a module given more than once may update its state, e.g., running statistics,
+        # so its calls must not run concurrently
+        if not input.is_cuda or len(modules) < 2 or len(set(map(id, modules))) < len(modules):
+            outputs = [module(input, *args, **kwargs) for module in modules]
+            return tuple(outputs)
+
+        # runs the independent branches on separate streams so that their kernels can overlap.
+        # new streams are taken from Pytorch's stream pool in every call
+        # so that nested modules do not wait for the streams of the outer branches
+        current = T.cuda.current_stream(input.device)
+        streams = [T.cuda.Stream(input.device) for _ in modules]
+        outputs = []
+        for stream, module in zip(streams, modules):
+            stream.wait_stream(current)
+            with T.cuda.stream(stream):
+                outputs.append(module(input, *args, **kwargs))
+
+        for stream, output in zip(streams, outputs):
+            current.wait_stream(stream)
+            if isinstance(output, T.Tensor):
+                # the output is allocated on a side stream but consumed on the current stream
+                output.record_stream(current)
+
         return tuple(outputs)
 
     @property
@@ -249,10 +617,6 @@ class MultiSingleInputModule(Module):
     def params(self):
         return tuple()
 
-    @property
-    def regularizable(self):
-        return tuple()
-
 
 class MultiMultiInputModule(MultiSingleInputModule):
     """
@@ -264,8 +628,8 @@ class MultiMultiInputModule(MultiSingleInputModule):
 
     def forward(self, *input, **kwargs):
         input_it = iter(input)
-        outputs = [module(next(input_it), **kwargs) if name.startswith('module') else module()
-                   for name, module in self.named_children()]
+        outputs = [module(next(input_it), **kwargs) if takes_input else module()
+                   for takes_input, module in self._children_with_kinds()]
         return tuple(outputs)
 
 
@@ -290,10 +654,6 @@ class SingleMultiInputModule(Module):
     def params(self):
         return tuple()
 
-    @property
-    def regularizable(self):
-        return tuple()
-
 
 @utils.add_simple_repr
 class Sequential(nn.Sequential, _LayerMethod):
@@ -317,13 +677,32 @@ class Sequential(nn.Sequential, _LayerMethod):
 
     def __getitem__(self, idx):
         if isinstance(idx, slice):
-            start = idx.start if idx.start else 0
-            modules = list(self._modules.items())
-            return Sequential(OrderedDict(modules[idx]), input_shape=modules[start][1].input_shape)
+            keys = list(self._modules.keys())[idx]
+            modules = OrderedDict((key, self._modules[key]) for key in keys)
+            input_shape = getattr(modules[keys[0]], 'input_shape', None) if keys else self.input_shape
+            return Sequential(modules, input_shape=input_shape)
         else:
             return self._get_item_by_idx(self._modules.values(), idx)
 
-    def forward(self, input, *args, **kwargs):
+    def forward(self, input):
+        for module in self:
+            input = module(input)
+        return input
+
+    def forward_with_args(self, input, *args, **kwargs):
+        """
+        Similar to :meth:`forward`, but passes extra arguments to every module.
+
+        :param input:
+            input tensor.
+        :param args:
+            extra arguments to be passed to the modules.
+        :param kwargs:
+            extra keyword arguments to be passed to the modules.
+        :return:
+            the output of the last module.
+        """
+
         for module in self._modules.values():
             input = module(input, *args, **kwargs)
         return input
@@ -341,6 +720,67 @@ class Sequential(nn.Sequential, _LayerMethod):
         for m in self.children():
             m.reset_parameters()
 
+    def jit(self):
+        """
+        Compiles the network with :func:`torch.jit.script`.
+        All the submodules must be scriptable.
+
+        :return:
+            a :class:`torch.jit.ScriptModule`.
+        """
+
+        return T.jit.script(self)
+
+    def fuse(self):
+        """
+        Folds every batch normalization into the convolution right before it.
+        The activation of the normalization layer, or a succeeding :class:`torch.nn.ReLU`,
+        is applied by the convolution instead.
+        The fused modules are replaced by identity modules so that indexing
+        and :attr:`output_shape` stay the same.
+        The network must be in evaluation mode.
+
+        :return:
+            the fused network.
+        """
+
+        assert not self.training, 'Fusion is only valid in evaluation mode'
+        _fuse_conv_bn(self)
+        return self
+
+
+def _fuse_conv_bn(sequential):
+    names = list(sequential._modules.keys())
+    idx = 0
+    while idx < len(names) - 1:
+        conv, bn = sequential._modules[names[idx]], sequential._modules[names[idx + 1]]
+        if not (isinstance(conv, nn.Conv2d) and isinstance(bn, nn.BatchNorm2d) and bn.track_running_stats):
+            idx += 1
+            continue
+
+        conv_act, bn_act = getattr(conv, 'activation', None), getattr(bn, 'activation', None)
+        conv_linear = conv_act is None or conv_act.func is utils.linear
+        bn_linear = bn_act is None or bn_act.func is utils.linear
+        if not conv_linear or (conv_act is None and not bn_linear):
+            idx += 1
+            continue
+
+        fused = fuse_conv_bn_eval(conv, bn)
+        n_fused = 2
+        if conv_act is not None:
+            if not bn_linear:
+                fused.activation = bn_act
+            elif idx + 2 < len(names) and isinstance(sequential._modules[names[idx + 2]], nn.ReLU):
+                fused.activation = utils.function('relu')
+                n_fused = 3
+
+        sequential._modules[names[idx]] = fused
+        shape = getattr(bn, 'output_shape', None)
+        for name in names[idx + 1:idx + n_fused]:
+            sequential._modules[name] = nn.Identity() if shape is None else \
+                Lambda(utils.linear, input_shape=shape, output_shape=shape)
+        idx += n_fused
+
 
 def wrapper(input_shape=None, output_shape=None, *args, **kwargs):
     """
@@ -398,27 +838,23 @@ def wrapper(input_shape=None, output_shape=None, *args, **kwargs):
                 return super().forward(input, *args, **kwargs)
 
             @property
-            @utils.validate
+            def input_shape(self):
+                return self._input_shape
+
+            @input_shape.setter
+            def input_shape(self, input_shape):
+                self._input_shape = input_shape
+                _reset_output_shape(self)
+
+            @_cached_output_shape
             def output_shape(self):
                 if self.input_shape is None and self.output_shape_tmp is None:
                     return None
 
                 if self.output_shape_tmp is not None:
                     return self.output_shape_tmp
-                else:
-                    none_indices = [k for k in range(len(self.input_shape)) if self.input_shape[k] is None]
-                    shape = [1 if s is None else s for s in self.input_shape]
-                    dummy = T.zeros(*shape)
-                    try:
-                        dummy = dummy.to(next(self.parameters()).device)
-                    except StopIteration:
-                        pass
-
-                    dummy = self(dummy)
-                    output_shape = list(dummy.shape)
-                    for k in none_indices:
-                        output_shape[k] = None
-                    return tuple(output_shape)
+
+                return _infer_output_shape(self, self, self.input_shape)
 
         _Wrapper.__name__ = module.__name__
         _Wrapper.__doc__ = module.__doc__
@@ -484,28 +920,37 @@ class Lambda(Module):
     def forward(self, *input):
         return self.func(*input, **self.kwargs)
 
+    def specialize(self):
+        """
+        Binds `kwargs` to `func` once so that :meth:`forward` calls
+        the function directly instead of unpacking `kwargs` every call.
+        `func` and `kwargs` should not be changed afterwards.
+
+        :return:
+            the module itself.
+        """
+
+        self.forward = functools.partial(self.func, **self.kwargs) if self.kwargs else self.func
+        return self
+
     @property
-    @utils.validate
+    def input_shape(self):
+        return self._input_shape
+
+    @input_shape.setter
+    def input_shape(self, input_shape):
+        self._input_shape = input_shape
+        _reset_output_shape(self)
+
+    @_cached_output_shape
     def output_shape(self):
         if self.input_shape is None and self.output_shape_tmp is None:
             return None
 
         if self.output_shape_tmp is not None:
             return self.output_shape_tmp
-        else:
-            none_indices = [k for k in range(len(self.input_shape)) if self.input_shape[k] is None]
-            shape = [1 if s is None else s for s in self.input_shape]
-            dummy = T.zeros(*shape)
-            try:
-                dummy = dummy.to(next(self.parameters()).device)
-            except StopIteration:
-                pass
-
-            dummy = self.forward(dummy)
-            output_shape = list(dummy.shape)
-            for k in none_indices:
-                output_shape[k] = None
-            return tuple(output_shape)
+
+        return _infer_output_shape(self, self.forward, self.input_shape)
 
     def extra_repr(self):
         s = '{}'.format(self.func.__name__)
@@ -92,12 +92,12 @@ class SequentialSum(Sum):
     def forward(self, input, *args, **kwargs):
         outputs = []
         output = input
-        for name, module in self.named_children():
-            if name.startswith('tensor'):
-                outputs.append(module())
-            else:
+        for takes_input, module in self._children_with_kinds():
+            if takes_input:
                 output = module(output)
                 outputs.append(output)
+            else:
+                outputs.append(module())
 
         return sum(outputs)
 
@@ -269,12 +269,12 @@ class SequentialCat(Cat):
     def forward(self, input, *args, **kwargs):
         outputs = []
         output = input
-        for name, module in self.named_children():
-            if name.startswith('tensor'):
-                outputs.append(module())
-            else:
+        for takes_input, module in self._children_with_kinds():
+            if takes_input:
                 output = module(output)
                 outputs.append(output)
+            else:
+                outputs.append(module())
 
         return T.cat(outputs, dim=self.dim)
 
@@ -1,6 +1,7 @@
 import numpy as np
 import torch as T
 import threading
+from collections import OrderedDict
 from queue import Queue
 from scipy.stats import truncnorm
 
@@ -8,7 +9,7 @@ from . import root_logger
 
 __all__ = ['DataLoader', 'DataPrefetcher', 'truncated_normal', 'batch_set_value', 'bulk_to_cuda', 'bulk_to_cuda_sparse',
            'bulk_to_numpy', 'to_cuda', 'to_cuda_sparse', 'to_numpy', 'batch_to_device', 'batch_to_cuda',
-           'batch_set_tensor', 'ReadWriteLock']
+           'batch_set_tensor', 'pack_state', 'unpack_state', 'ReadWriteLock']
 
 
 class ReadWriteLock:
@@ -530,6 +531,75 @@ def bulk_to_cuda_sparse(xs, non_blocking=False):
     return tuple([to_cuda_sparse(x, non_blocking=non_blocking) for x in xs])
 
 
+def _check_view_dtype():
+    # viewing a tensor as a dtype of a different element size requires Pytorch 1.11
+    try:
+        T.zeros(1, dtype=T.int16).view(T.uint8)
+    except RuntimeError:
+        raise RuntimeError('Packing tensors requires Pytorch 1.11 or later') from None
+
+
+def pack_state(state):
+    """
+    Packs a dictionary of tensors, e.g., a state dict, into a single contiguous byte buffer.
+    Each tensor starts at an offset aligned to its element size.
+    Requires Pytorch 1.11 or later.
+
+    :param state:
+        a dictionary of :class:`torch.Tensor` s.
+    :return:
+        a tuple of the metadata and the buffer.
+        The metadata is a list of ``(name, dtype, shape, offset, nbytes)`` of each tensor,
+        where `dtype` is the name of the :class:`torch.dtype`.
+        The buffer is a 1D CPU :class:`torch.Tensor` of type ``uint8``.
+    """
+
+    _check_view_dtype()
+    meta = []
+    offset = 0
+    for name, x in state.items():
+        size = x.element_size()
+        offset = (offset + size - 1) // size * size
+        nbytes = x.numel() * size
+        meta.append((name, str(x.dtype).split('.')[-1], tuple(x.shape), offset, nbytes))
+        offset += nbytes
+
+    blob = T.empty(offset, dtype=T.uint8)
+    for (_, _, _, offset, nbytes), x in zip(meta, state.values()):
+        blob[offset:offset + nbytes].copy_(x.detach().reshape(-1).view(T.uint8))
+
+    return meta, blob
+
+
+def unpack_state(meta, blob, device=None):
+    """
+    Unpacks the result of :func:`pack_state`.
+    The returned tensors are views of `blob` so no copy is made
+    unless `blob` has to be moved to `device`.
+    Requires Pytorch 1.11 or later.
+
+    :param meta:
+        a list of ``(name, dtype, shape, offset, nbytes)`` of each tensor.
+    :param blob:
+        a 1D :class:`torch.Tensor` of type ``uint8`` containing the tensors.
+    :param device:
+        the device to move `blob` to.
+        If ``None``, the tensors are on the device of `blob`.
+    :return:
+        an :class:`~collections.OrderedDict` of :class:`torch.Tensor` s.
+    """
+
+    _check_view_dtype()
+    if device is not None:
+        blob = blob.to(device)
+
+    state = OrderedDict()
+    for name, dtype, shape, offset, nbytes in meta:
+        state[name] = blob[offset:offset + nbytes].view(getattr(T, dtype)).reshape(shape)
+
+    return state
+
+
 def batch_to_device(batch, device=0, non_blocking=False):
     """
     Moves a batch to the specified device.
@@ -31,7 +31,7 @@ def validate(func):
         if isinstance(shape, numbers.Number):
             return int(shape)
 
-        out = [None if x is None or np.isnan(x) else int(x) for x in func(self)]
+        out = [None if x is None or np.isnan(x) else int(x) for x in shape]
         return tuple(out)
 
     return wrapper
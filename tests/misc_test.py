@@ -1,3 +1,4 @@
+import pickle
 import torch as T
 import numpy as np
 from torch import testing
@@ -108,7 +109,7 @@ def test_monitor(device):
 
 @pytest.mark.parametrize(
     'idx',
-    (slice(None, None), slice(None, 2), slice(1, None), slice(1, 3))
+    (slice(None, None), slice(None, 2), slice(1, None), slice(1, 3), slice(-3, None), slice(-3, -1), slice(1, None, 2))
 )
 def test_slicing_sequential(idx):
     input_shape = (None, 3, 256, 256)
@@ -139,6 +140,361 @@ def test_slicing_sequential(idx):
     assert b.input_shape == a[start].input_shape
 
 
+def test_output_shape_cache():
+    calls = []
+
+    def foo(x):
+        calls.append(x.shape)
+        return x[:, :2]
+
+    lambda_ = nnt.Lambda(foo, input_shape=(None, 3, 4))
+    assert lambda_.output_shape == (None, 2, 4)
+    assert lambda_.output_shape == (None, 2, 4)
+    assert len(calls) == 1
+
+    lambda_.input_shape = (None, 5, 6)
+    assert lambda_.output_shape == (None, 2, 6)
+    assert len(calls) == 2
+
+    flatten = nnt.wrapper(input_shape=(None, 3, 4))(T.nn.Flatten)()
+    assert flatten.output_shape == (None, 12)
+    flatten.input_shape = (None, 2, 4)
+    assert flatten.output_shape == (None, 8)
+
+
+def test_output_shape_then_backward():
+    class Foo(T.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.weight = T.nn.Parameter(T.ones(4))
+            self.scale = None
+
+        def forward(self, input):
+            if self.scale is None:
+                self.scale = 2. * T.ones(input.shape[-1])
+            return input + self.weight * self.scale
+
+    foo = nnt.wrapper(input_shape=(None, 4))(Foo)()
+    assert foo.output_shape == (None, 4)
+    foo(T.rand(2, 4)).sum().backward()
+    testing.assert_allclose(foo.weight.grad, 4. * T.ones(4))
+
+
+def test_lambda_specialize():
+    a, b = T.rand(3, 1), T.rand(3, 2)
+    cat = nnt.Lambda(T.cat, input_shape=(None, 1), dim=1)
+    expected = cat((a, b))
+    assert cat.specialize() is cat
+    testing.assert_allclose(cat((a, b)), expected)
+
+    neg = nnt.Lambda(T.neg, input_shape=(None, 2)).specialize()
+    testing.assert_allclose(neg(b), -b)
+    assert neg.output_shape == (None, 2)
+
+
+@pytest.mark.parametrize('device', dev)
+def test_sequential_fuse(device):
+    shape = (2, 3, 8, 8)
+    a = T.rand(*shape).to(device)
+
+    net = nnt.Sequential(input_shape=shape)
+    net.conv_bn = nnt.ConvNormAct(shape, 4, 3)
+    net.conv = nnt.Conv2d(net.output_shape, 5, 3)
+    net.bn = nnt.BatchNorm2d(net.output_shape)
+    net.relu = nnt.wrapper(net.output_shape)(T.nn.ReLU)()
+    net = net.to(device).eval()
+    expected = net(a)
+    expected_shape = net.output_shape
+
+    net.conv_bn.fuse()
+    net.fuse()
+    testing.assert_allclose(net(a), expected)
+    assert net.output_shape == expected_shape
+    assert not any(isinstance(m, T.nn.BatchNorm2d) for m in net.modules())
+
+    net = nnt.ResNetBasicBlock(shape, 8).to(device)
+    net(a)
+    expected = net.eval()(a)
+    net.train(True)
+    net.fuse_for_inference()
+    assert not net.training
+    testing.assert_allclose(net(a), expected)
+    assert not any(isinstance(m, T.nn.BatchNorm2d) for m in net.modules())
+
+    seq = nnt.Sequential(T.nn.Conv2d(3, 4, 3), T.nn.BatchNorm2d(4), T.nn.ReLU()).to(device).eval()
+    expected = seq(a)
+    scripted = seq.fuse().jit()
+    testing.assert_allclose(scripted(a), expected)
+
+
+def test_regularizable():
+    shape = (None, 3, 8, 8)
+    net = nnt.Sequential(input_shape=shape)
+    net.conv = nnt.Conv2d(net.output_shape, 4, 3)
+    net.bn = nnt.BatchNorm2d(net.output_shape, affine=False)
+    net.block = nnt.ConvNormAct(net.output_shape, 5, 3)
+    net.fc = nnt.FC(net.output_shape, 10, flatten=True)
+    net.fc.weight.requires_grad_(False)
+    net.linear = T.nn.Linear(10, 2)
+    net.linear_wn = T.nn.utils.weight_norm(T.nn.Linear(2, 2))
+
+    expected = (net.conv.weight, net.block.conv.weight, net.block.norm.weight, net.linear.weight,
+                net.linear_wn.weight)
+    assert len(net.regularizable) == len(expected)
+    assert all(p is q for p, q in zip(net.regularizable, expected))
+
+    net = nnt.Sequential(input_shape=(None, 4))
+    net.fc = nnt.FC(net.output_shape, 3)
+    net.eval().enable_jit(T.rand(2, 4))
+    assert isinstance(net.fc, T.jit.ScriptModule)
+    assert len(net.regularizable) == 1 and net.regularizable[0] is net.fc.weight
+
+    net.orth = T.nn.utils.parametrizations.orthogonal(T.nn.Linear(3, 3))
+    assert len(net.regularizable) == 2
+    testing.assert_allclose(net.regularizable[1], net.orth.weight)
+
+    sum = nnt.ConcurrentSum(nnt.FC(10, 4), nnt.FC(10, 4))
+    expected = (sum.module0.weight, sum.module1.weight)
+    net = nnt.Sequential(sum)
+    for m in (sum, net):
+        assert len(m.regularizable) == len(expected)
+        assert all(p is q for p, q in zip(m.regularizable, expected))
+
+
+@pytest.mark.parametrize('device', dev)
+def test_channels_last(device):
+    shape = (2, 3, 8, 8)
+    a = T.rand(*shape).to(device)
+
+    net = nnt.Sequential(input_shape=shape)
+    net.conv_bn = nnt.ConvNormAct(shape, 4, 3)
+    net.conv = nnt.Conv2d(net.output_shape, 5, 3)
+    net = net.to(device)
+    expected = net(a)
+
+    net.to_channels_last()
+    for m in (net.conv_bn.conv, net.conv):
+        assert m.weight.is_contiguous(memory_format=T.channels_last)
+    testing.assert_allclose(net(a.contiguous(memory_format=T.channels_last)), expected)
+
+
+@pytest.mark.parametrize('device', dev)
+def test_enable_jit(device):
+    shape = (2, 3, 8, 8)
+    a = T.rand(*shape).to(device)
+
+    net = nnt.Sequential(input_shape=shape)
+    net.conv = nnt.Conv2d(shape, 4, 3)
+    net.relu = nnt.wrapper(net.output_shape)(T.nn.ReLU)()
+    net.fc = nnt.FC(net.output_shape, 5, flatten=True)
+    net = net.to(device).eval()
+    expected = net(a)
+    expected_shape = net.output_shape
+
+    net.enable_jit(a)
+    assert all(isinstance(m, T.jit.ScriptModule) for m in net.children())
+    testing.assert_allclose(net(a), expected)
+    assert net.output_shape == expected_shape
+
+    net = nnt.Sequential(input_shape=shape)
+    net.conv_bn = nnt.ConvNormAct(shape, 4, 3)
+    net.fc = nnt.FC(net.output_shape, 5, flatten=True)
+    net = net.to(device).train()
+    running_mean = net.conv_bn.norm.running_mean.clone()
+
+    net.enable_jit(a)
+    testing.assert_allclose(net.state_dict()['conv_bn.norm.running_mean'], running_mean)
+    assert net.state_dict()['conv_bn.norm.num_batches_tracked'] == 0
+
+
+@pytest.mark.parametrize('device', dev)
+def test_save_load(device, tmp_path):
+    shape = (2, 3, 8, 8)
+    a = T.rand(*shape).to(device)
+
+    net1 = nnt.ConvNormAct(shape, 4, 3).to(device)
+    net1(a)
+    net1.eval()
+    net2 = nnt.ConvNormAct(shape, 4, 3).to(device)
+
+    for numpy, pack in ((False, False), (True, False), (False, True)):
+        param_file = str(tmp_path / 'weights.pt')
+        net1.save(param_file, numpy=numpy, pack=pack)
+        if numpy:
+            with pytest.raises(pickle.UnpicklingError):
+                net2.load(param_file, weights_only=True)
+
+        net2.load(param_file, weights_only=not numpy)
+        assert not net2.training
+        for k, v in net2.state_dict().items():
+            assert v.device == a.device
+            testing.assert_allclose(v, net1.state_dict()[k])
+        testing.assert_allclose(net2(a), net1(a))
+
+    class Foo(nnt.Module):
+        def __init__(self):
+            super().__init__()
+            self.fc = nnt.FC(3, 2)
+            self.step = 0
+
+        def get_extra_state(self):
+            return {'step': self.step}
+
+        def set_extra_state(self, state):
+            self.step = state['step']
+
+    foo1, foo2 = Foo(), Foo()
+    foo1.step = 3
+    foo1.save(param_file)
+    foo2.load(param_file)
+    assert foo2.step == 3
+    testing.assert_allclose(foo2.fc.weight, foo1.fc.weight)
+
+    with open(param_file, 'wb') as f:
+        f.write(b'garbage')
+
+    for weights_only in (False, True):
+        with pytest.raises(pickle.UnpicklingError) as e:
+            net2.load(param_file, weights_only=weights_only)
+        assert ('Cannot load' in str(e.value)) == weights_only
+
+
+@pytest.mark.parametrize('device', dev)
+def test_pack_state(device):
+    state = {
+        'mask': T.tensor([True, False, True]),
+        'weight': T.rand(3, 2).t(),
+        'step': T.tensor(5),
+        'half': T.rand(3).half(),
+        'bf16': T.rand(2).bfloat16(),
+        'double': T.rand(2, 2).double(),
+        'empty': T.zeros(0)
+    }
+    state = {k: v.to(device) for k, v in state.items()}
+
+    meta, blob = nnt.utils.pack_state(state)
+    assert blob.dtype == T.uint8 and blob.device == T.device('cpu')
+
+    unpacked = nnt.utils.unpack_state(meta, blob, device=device)
+    assert list(unpacked.keys()) == list(state.keys())
+    for k, v in state.items():
+        assert unpacked[k].dtype == v.dtype and unpacked[k].device == v.device
+        assert unpacked[k].data_ptr() % unpacked[k].element_size() == 0
+        testing.assert_allclose(unpacked[k].float(), v.float())
+
+
+@pytest.mark.parametrize('device', dev)
+@pytest.mark.parametrize('cls, reduce', [(nnt.Sum, sum), (nnt.Cat, lambda x: T.cat(x, dim=1))])
+def test_multi_single_input(device, cls, reduce):
+    shape = (2, 3, 8, 8)
+    a = T.rand(*shape, device=device, requires_grad=True)
+    branches = [nnt.ConvNormAct(shape, 4, 3).to(device) for _ in range(3)]
+    constant = T.rand(2, *branches[0].output_shape[1:], device=device)
+
+    expected = reduce([branch(a) for branch in branches] + [constant])
+    params = [a] + [p for branch in branches for p in branch.parameters()]
+    expected_grads = T.autograd.grad(expected.sum(), params)
+
+    module = cls(*branches, constant) if cls is nnt.Sum else cls(1, *branches, constant)
+    output = module(a)
+    grads = T.autograd.grad(output.sum(), params)
+    testing.assert_allclose(output, expected)
+    for grad, expected_grad in zip(grads, expected_grads):
+        testing.assert_allclose(grad, expected_grad)
+
+
+def test_multi_input_shared_module():
+    x, y = T.rand(2, 3), T.rand(2, 3)
+    fc = nnt.FC(3, 3)
+    testing.assert_allclose(nnt.Sum(fc, fc)(x), 2. * fc(x))
+    testing.assert_allclose(nnt.ConcurrentSum(fc, fc)(x, y), fc(x) + fc(y))
+    testing.assert_allclose(nnt.SequentialSum(fc, fc)(x), fc(x) + fc(fc(x)))
+
+
+@pytest.mark.parametrize('device', dev)
+def test_multi_single_input_shared_module(device):
+    x = T.rand(4, 3, 8, 8).to(device)
+    block1 = nnt.ConvNormAct(x.shape, 4, 3).to(device)
+    block2 = nnt.ConvNormAct(x.shape, 4, 3).to(device)
+    block2.load_state_dict(block1.state_dict())
+
+    expected = block1(x) + block1(x)
+    testing.assert_allclose(nnt.Sum(block2, block2)(x), expected)
+    testing.assert_allclose(block2.norm.running_mean, block1.norm.running_mean)
+    assert block2.norm.num_batches_tracked == 2
+
+
+def test_net_stats():
+    class Foo(nnt.Net, nnt.Module):
+        pass
+
+    net = Foo()
+    net.stats.train.scalars['loss'] = 1.
+    net.stats['eval']['images']['img'] = 2.
+    assert net.stats['train']['scalars'] is net.stats.train.scalars
+    assert net.stats.eval.images == {'img': 2.}
+    assert dict(net.stats.train.items()) == {'scalars': {'loss': 1.}, 'images': {}, 'histograms': {},
+                                             'pointclouds': {}}
+
+    net.stats['train']['scalars'] = {}
+    assert net.stats.train.scalars == {}
+    for key in ('test', 'keys', 0):
+        with pytest.raises(KeyError):
+            net.stats[key]
+
+    assert len(net.stats) == 2 and 'train' in net.stats and 'keys' not in net.stats
+    assert net.stats.train.get('scalars') == {} and net.stats.train.get('test') is None
+    assert list(net.stats.eval.values()) == [{}, {'img': 2.}, {}, {}]
+    net.stats.train.update(scalars={'loss': 3.})
+    assert net.stats.train == {'scalars': {'loss': 3.}, 'images': {}, 'histograms': {}, 'pointclouds': {}}
+
+
+@pytest.mark.parametrize('device', dev)
+def test_tensor_constants(device):
+    shape = (3, 2, 4, 4)
+    a = T.rand(*shape)
+    b = T.rand(*shape)
+
+    sum = nnt.ConcurrentSum(a, nnt.Lambda(lambda x: 2. * x, output_shape=shape, input_shape=shape))
+    assert len(sum.state_dict()) == 0
+
+    sum = sum.to(device).double()
+    b = b.to(device).double()
+    output = sum(b)
+    assert output.device == b.device and output.dtype == T.float64
+    testing.assert_allclose(output, a.to(device).double() + 2. * b)
+
+    sum.module2 = nnt.Lambda(lambda x: -x, output_shape=shape, input_shape=shape)
+    testing.assert_allclose(sum(b, b), a.to(device).double() + b)
+
+
+@pytest.mark.parametrize('device', dev)
+def test_parameter_constants(device):
+    shape = (2, 3)
+
+    class Foo(nnt.Module):
+        def __init__(self):
+            super().__init__()
+            self.bias = T.nn.Parameter(T.ones(*shape))
+            self.sum = nnt.ConcurrentSum(nnt.Lambda(lambda x: x, input_shape=shape, output_shape=shape), self.bias)
+
+        def forward(self, input):
+            return self.sum(input)
+
+    foo = Foo().to(device).double()
+    assert list(foo.state_dict().keys()) == ['bias']
+    assert foo.sum.tensor1.value is foo.bias
+
+    opt = T.optim.SGD(foo.parameters(), lr=1.)
+    x = T.zeros(*shape).to(device).double()
+    foo(x).sum().backward()
+    opt.step()
+    testing.assert_allclose(foo(x), T.zeros(*shape).to(device).double())
+
+    foo = foo.float()
+    testing.assert_allclose(foo(x.float()), T.zeros(*shape).to(device))
+
+
 @pytest.mark.parametrize('device', dev)
 @pytest.mark.parametrize('bs', (pytest.param(None, marks=pytest.mark.xfail), 1, 2, 3, 4, 5))
 @pytest.mark.parametrize('shuffle', (True, False))